@@ -1,10 +1,21 @@
+import asyncio
+from typing import Optional
+
 import fastapi
 import uvicorn
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from challenge.schemas.templates import RequestTemplate, FitRequestTemplate
-from challenge.services.services import train_model, predict_service, update_model, predict_proba_service
+from challenge.services.prediction_log_service import prediction_logger, start_prediction_log, stop_prediction_log
+from challenge.services.traffic_capture_service import (capture_request, start_traffic_capture,
+                                                        stop_traffic_capture, traffic_capture)
+from challenge.services.services import (train_model, predict_service, update_model, predict_proba_service,
+                                         drift_service, select_model, model_pool, model_routes, warm_up_models)
 from challenge.settings import Settings
+from challenge.utils.admission import AdmissionController
+from challenge.utils.arrival import ArrivalTimeMiddleware
 from challenge.utils.logger import get_logger
 
 settings = Settings()
@@ -14,13 +25,56 @@ app = fastapi.FastAPI(
     version=settings.APP_VERSION,
     description='API to calculate probability of flight delay'
 )
+app.add_middleware(ArrivalTimeMiddleware)
 
 logger = get_logger()
 
+admission_controllers = {
+    'predict': AdmissionController(name='predict',
+                                   max_concurrency=settings.ADMISSION_PREDICT_CONCURRENCY,
+                                   max_queue_size=settings.ADMISSION_PREDICT_QUEUE_SIZE,
+                                   max_wait_seconds=settings.ADMISSION_PREDICT_MAX_WAIT_SECONDS),
+    'predict-proba': AdmissionController(name='predict-proba',
+                                         max_concurrency=settings.ADMISSION_PREDICT_CONCURRENCY,
+                                         max_queue_size=settings.ADMISSION_PREDICT_QUEUE_SIZE,
+                                         max_wait_seconds=settings.ADMISSION_PREDICT_MAX_WAIT_SECONDS),
+    'fit': AdmissionController(name='fit',
+                               max_concurrency=settings.ADMISSION_FIT_CONCURRENCY,
+                               max_queue_size=settings.ADMISSION_FIT_QUEUE_SIZE,
+                               max_wait_seconds=settings.ADMISSION_FIT_MAX_WAIT_SECONDS)
+}
+
+
+def get_priority(data: RequestTemplate) -> int:
+    """Small interactive requests are admitted before bulk ones."""
+
+    return 0 if len(data.flights) <= settings.ADMISSION_SMALL_REQUEST_FLIGHTS else 1
+
+
+app.state.ready = False
+
+
+async def warm_up_model():
+    try:
+        await run_in_threadpool(warm_up_models)
+    except Exception as e:
+        logger.error(f'Warm-up failed, the instance will not report ready: {str(e)}')
+        return
+    app.state.ready = True
+
 
 @app.on_event('startup')
 async def startup():
     update_model()
+    start_prediction_log()
+    start_traffic_capture()
+    app.state.warm_up_task = asyncio.get_running_loop().create_task(warm_up_model())
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    stop_prediction_log()
+    stop_traffic_capture()
 
 
 @app.get("/health", status_code=200)
@@ -31,24 +85,42 @@ async def get_health() -> dict:
     }
 
 
-@app.post("/predict", status_code=200)
-async def post_predict(data: RequestTemplate) -> dict:
-    try:
-        predictions = predict_service(data=data.flights)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f'An error occurred during prediction: {str(e)}')
+@app.get("/ready", status_code=200)
+async def get_ready():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "WARMING_UP"})
+    return {
+        "status": "READY"
+    }
 
+
+@app.post("/predict", status_code=200)
+async def post_predict(data: RequestTemplate, request: Request, response: Response) -> dict:
+    capture_request(endpoint='/predict', data=data, arrival=request.state.arrival)
+    async with admission_controllers['predict'].admit(priority=get_priority(data)):
+        try:
+            delay_model = await run_in_threadpool(select_model, data.model_id)
+            predictions = await run_in_threadpool(predict_service, data=data.flights, delay_model=delay_model)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f'An error occurred during prediction: {str(e)}')
+
+    if delay_model.model_id is not None:
+        response.headers['X-Model-Id'] = delay_model.model_id
     return {'predict': predictions}
 
 
 @app.post('/fit', status_code=200)
 async def post_fit(request: FitRequestTemplate) -> dict:
     logger.info("Request received for the fit endpoint")
-    try:
-        trained_model = train_model(bucket_name=request.bucket_name, cloud_data=request.cloud_data)
-        return {"trained_model": trained_model}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred during training: {str(e)}")
+    async with admission_controllers['fit'].admit():
+        try:
+            trained_model = await run_in_threadpool(train_model, bucket_name=request.bucket_name,
+                                                    cloud_data=request.cloud_data)
+            return {"trained_model": trained_model}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An error occurred during training: {str(e)}")
 
 
 @app.get('/update-model', status_code=200)
@@ -56,20 +128,53 @@ async def force_update_model(model_id: str, cloud: bool) -> dict:
     if model_id.endswith('.pkl'):
         raise HTTPException(status_code=400, detail='Model id should not have extension')
     try:
-        status = update_model(model_name=f'{model_id}.pkl', cloud=cloud)
+        status = await run_in_threadpool(update_model, model_name=f'{model_id}.pkl', cloud=cloud)
         return {'updated_model': model_id, 'status': status}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'An error occurred during updating model: {str(e)}')
 
 
 @app.post('/predict-proba', status_code=200)
-async def post_predict_proba(data: RequestTemplate) -> dict:
-    try:
-        predictions = predict_proba_service(data=data.flights)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f'An error occurred during prediction: {str(e)}')
-
+async def post_predict_proba(data: RequestTemplate, request: Request, response: Response) -> dict:
+    capture_request(endpoint='/predict-proba', data=data, arrival=request.state.arrival)
+    async with admission_controllers['predict-proba'].admit(priority=get_priority(data)):
+        try:
+            delay_model = await run_in_threadpool(select_model, data.model_id)
+            predictions = await run_in_threadpool(predict_proba_service, data=data.flights, delay_model=delay_model)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f'An error occurred during prediction: {str(e)}')
+
+    if delay_model.model_id is not None:
+        response.headers['X-Model-Id'] = delay_model.model_id
     return {'predict': predictions}
 
+
+@app.get('/prediction-log/stats', status_code=200)
+async def get_prediction_log_stats() -> dict:
+    return prediction_logger.stats()
+
+
+@app.get('/traffic-capture/stats', status_code=200)
+async def get_traffic_capture_stats() -> dict:
+    return traffic_capture.stats()
+
+
+@app.get('/drift', status_code=200)
+async def get_drift(model_id: Optional[str] = None) -> dict:
+    return drift_service(model_id=model_id)
+
+
+@app.get('/model-pool', status_code=200)
+async def get_model_pool() -> dict:
+    return {**model_pool.stats(), 'routes': model_routes}
+
+
+@app.get('/admission', status_code=200)
+async def get_admission() -> dict:
+    return {name: controller.stats() for name, controller in admission_controllers.items()}
+
+
 if __name__ == '__main__':
     uvicorn.run(app, host='0.0.0.0', port=8080, loop='asyncio')
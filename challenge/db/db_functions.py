@@ -3,10 +3,15 @@ from datetime import datetime
 from fastapi import HTTPException
 from google.cloud import bigquery
 
+from challenge.utils.logger import get_logger
+
+logger = get_logger()
+
 
 def save_metrics_to_bigquery(metrics: dict, project_id: str, dataset_id: str, table_id: str, model_id: str):
     """
-    Save the model's performance metrics in BigQuery.
+    Save the model's performance metrics in BigQuery. Columns missing from the table, such as the training
+    columns on tables created before they existed, are left out of the row instead of failing the insert.
 
     Args:
         metrics (dict): A dict with model performance metrics.
@@ -33,10 +38,19 @@ def save_metrics_to_bigquery(metrics: dict, project_id: str, dataset_id: str, ta
         'precision_weighted': metrics['weighted avg']['precision'],
         'recall_weighted': metrics['weighted avg']['recall'],
         'f1_score_weighted': metrics['weighted avg']['f1-score'],
+        'best_iteration': metrics['training']['best_iteration'],
+        'fit_seconds': metrics['training']['fit_seconds'],
+        'stopped_by_time_budget': metrics['training']['stopped_by_time_budget'],
         'training_date': datetime.utcnow().isoformat()
     }
 
-    table = f'{project_id}.{dataset_id}.{table_id}'
+    table = client.get_table(f'{project_id}.{dataset_id}.{table_id}')
+    columns = {field.name for field in table.schema}
+    missing_columns = sorted(set(row_to_insert) - columns)
+    if missing_columns:
+        logger.warning(f'Metrics table {table_id} has no columns {missing_columns}, they are not saved')
+        row_to_insert = {key: value for key, value in row_to_insert.items() if key in columns}
+
     errors = client.insert_rows_json(table, [row_to_insert])
 
     if errors:
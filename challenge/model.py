@@ -1,9 +1,10 @@
 import pickle
+import time
 
 import numpy as np
 import pandas as pd
 
-from typing import Tuple, Union, List
+from typing import Tuple, Union, List, Optional
 
 import xgboost
 from fastapi import HTTPException
@@ -11,9 +12,12 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
+from challenge.monitoring.drift import compute_distribution
+from challenge.schemas.templates import VALID_AIRLINES, VALID_FLIGHT_TYPES, VALID_MONTHS
 from challenge.settings import Settings
 from challenge.utils.logger import get_logger
 from challenge.utils.preprocessor import Preprocessor
+from challenge.utils.training import TimeBudgetCallback, available_cpus
 
 settings = Settings()
 logger = get_logger()
@@ -25,6 +29,9 @@ class DelayModel:
         self
     ):
         self._model = None  # Model should be saved in this attribute.
+        self.model_id = None
+        self._training_distribution = None
+        self.feature_pipeline = settings.FEATURE_PIPELINE
         self.preprocessor = Preprocessor()
         self.top_10_features = [
             "OPERA_Latin American Wings",
@@ -46,7 +53,8 @@ class DelayModel:
         target_column: str = None
     ) -> Union[Tuple[pd.DataFrame, pd.DataFrame], pd.DataFrame]:
         """
-        Prepare raw data for training or predict.
+        Prepare raw data for training or predict. Training (target_column set) uses the FEATURE_PIPELINE setting,
+        serving uses the pipeline of the loaded model.
 
         Args:
             data (pd.DataFrame): raw data.
@@ -65,26 +73,49 @@ class DelayModel:
                 data['min_diff'] = data.apply(self.preprocessor.get_min_diff, axis=1)
                 data['delay'] = np.where(data['min_diff'] > self._threshold_in_minutes, 1, 0)
 
-            features = pd.concat([
-                pd.get_dummies(data['OPERA'], prefix='OPERA'),
-                pd.get_dummies(data['TIPOVUELO'], prefix='TIPOVUELO'),
-                pd.get_dummies(data['MES'], prefix='MES')],
-                axis=1
-            )
+            pipeline = settings.FEATURE_PIPELINE if target_column else self.feature_pipeline
+            if pipeline == 'categorical':
+                features = self._categorical_features(data)
+            else:
+                features = self._one_hot_features(data)
 
         except Exception:
             raise HTTPException(status_code=500, detail="Internal server error")
 
+        if target_column:
+            self._training_distribution = compute_distribution(data)
+            target = data[target_column]
+            return features, target.to_frame()
+
+        return features
+
+    def _one_hot_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        features = pd.concat([
+            pd.get_dummies(data['OPERA'], prefix='OPERA'),
+            pd.get_dummies(data['TIPOVUELO'], prefix='TIPOVUELO'),
+            pd.get_dummies(data['MES'], prefix='MES')],
+            axis=1
+        )
+
         for column in self.top_10_features:
             if column not in features.columns:
                 features[column] = 0
 
-        if target_column:
-            target = data[target_column]
-            return features[self.top_10_features].reindex(columns=self.top_10_features, fill_value=0), target.to_frame()
-
         return features[self.top_10_features].reindex(columns=self.top_10_features, fill_value=0)
 
+    @staticmethod
+    def _categorical_features(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep OPERA, TIPOVUELO and MES as category columns with fixed categories, so the codes seen in
+        training and serving always match. Unknown values become missing.
+        """
+
+        return pd.DataFrame({
+            'OPERA': pd.Categorical(data['OPERA'], categories=VALID_AIRLINES),
+            'TIPOVUELO': pd.Categorical(data['TIPOVUELO'], categories=VALID_FLIGHT_TYPES),
+            'MES': pd.Categorical(data['MES'], categories=VALID_MONTHS)
+        }, index=data.index)
+
     def fit(
         self,
         features: pd.DataFrame,
@@ -93,6 +124,10 @@ class DelayModel:
         """
         Fit model with preprocessed data.
 
+        Training is configured by the TRAIN_* settings. Optionally, part of the training split is held out for
+        early stopping and training stops on a wall-clock budget; the iteration used and the time spent are
+        returned under the 'training' key of the metrics.
+
         Args:
             features (pd.DataFrame): preprocessed data.
             target (pd.DataFrame): target.
@@ -101,15 +136,57 @@ class DelayModel:
         x_train, x_test, y_train, y_test = train_test_split(features, target, test_size=0.33, random_state=42)
         logger.info('Split data')
         scale = len(y_train[y_train.delay == 0]) / len(y_train[y_train.delay == 1])
-        model = xgboost.XGBClassifier(random_state=1, learning_rate=0.01, scale_pos_weight=scale)
 
-        model.fit(x_train, y_train)
-        logger.info('Fit model')
+        eval_set = None
+        if settings.TRAIN_VALIDATION_SIZE > 0:
+            x_train, x_validation, y_train, y_validation = train_test_split(
+                x_train, y_train, test_size=settings.TRAIN_VALIDATION_SIZE, random_state=42, stratify=y_train)
+            eval_set = [(x_validation, y_validation)]
+
+        time_budget = TimeBudgetCallback(settings.TRAIN_TIME_BUDGET_SECONDS) \
+            if settings.TRAIN_TIME_BUDGET_SECONDS > 0 else None
+
+        model = xgboost.XGBClassifier(
+            random_state=1,
+            learning_rate=settings.TRAIN_LEARNING_RATE,
+            scale_pos_weight=scale,
+            n_estimators=settings.TRAIN_N_ESTIMATORS,
+            tree_method=settings.TRAIN_TREE_METHOD,
+            n_jobs=settings.TRAIN_N_JOBS or available_cpus(),
+            early_stopping_rounds=settings.TRAIN_EARLY_STOPPING_ROUNDS if eval_set else None,
+            callbacks=[time_budget] if time_budget else None,
+            enable_categorical=settings.FEATURE_PIPELINE == 'categorical'
+        )
+
+        start = time.perf_counter()
+        model.fit(x_train, y_train, eval_set=eval_set, verbose=False)
+        fit_seconds = time.perf_counter() - start
+        model.set_params(callbacks=None)
+        logger.info(f'Fit model in {fit_seconds:.1f} s')
+
+        boosted_rounds = model.get_booster().num_boosted_rounds()
+        best_iteration = model.best_iteration if eval_set else boosted_rounds - 1
         y_pred = model.predict(x_test)
 
+        model.training_snapshot = {
+            'features': self._training_distribution or {},
+            'delay_rate': float(target['delay'].mean()),
+            'predicted_delay_rate': float(np.mean(y_pred)),
+            'rows': len(target)
+        }
+
         self.load_model(model)
 
-        return classification_report(y_test, y_pred, output_dict=True), model
+        metrics = classification_report(y_test, y_pred, output_dict=True)
+        metrics['training'] = {
+            'best_iteration': best_iteration,
+            'boosted_rounds': boosted_rounds,
+            'n_estimators': settings.TRAIN_N_ESTIMATORS,
+            'fit_seconds': fit_seconds,
+            'stopped_by_time_budget': bool(time_budget and time_budget.stopped)
+        }
+
+        return metrics, model
 
     def predict(
         self,
@@ -134,8 +211,23 @@ class DelayModel:
 
         return predictions.tolist()
 
-    def load_model(self, model):
+    @property
+    def training_snapshot(self) -> Optional[dict]:
+        """
+        Training distribution of OPERA, TIPOVUELO and MES and the delay rates, saved with the model by fit.
+        """
+
+        return getattr(self._model, 'training_snapshot', None)
+
+    def load_model(self, model, model_id: str = None):
         self._model = model
+        self.model_id = model_id
+        if hasattr(model, 'feature_pipeline'):
+            self.feature_pipeline = model.feature_pipeline
+        elif getattr(model, 'enable_categorical', False):
+            self.feature_pipeline = 'categorical'
+        else:
+            self.feature_pipeline = 'one_hot'
 
     def predict_proba(self, features: pd.DataFrame) -> List[int]:
         """
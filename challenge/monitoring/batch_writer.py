@@ -0,0 +1,243 @@
+import json
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from google.cloud import bigquery
+
+from challenge.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class RecordSink(ABC):
+
+    @abstractmethod
+    def write(self, rows: List[dict]):
+        """
+        Persist a batch of records. Must raise if the batch was not persisted.
+
+        Args:
+            rows (List[dict]): records.
+        """
+
+
+class BigQueryRecordSink(RecordSink):
+
+    def __init__(self, project_id: str, dataset_id: str, table_id: str):
+        self._table = f'{project_id}.{dataset_id}.{table_id}'
+        self._project_id = project_id
+        self._client = None
+
+    def write(self, rows: List[dict]):
+        if self._client is None:
+            self._client = bigquery.Client(project=self._project_id)
+
+        errors = self._client.insert_rows_json(self._table, rows)
+        if errors:
+            raise RuntimeError(f'An error occurred trying to insert records into {self._table}: {errors}')
+
+
+class FileRecordSink(RecordSink):
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def write(self, rows: List[dict]):
+        append_rows(self.file_path, rows)
+
+
+class BatchWriter:
+    """
+    Buffers records in a bounded in-memory queue and writes them to a sink in batches from a background thread,
+    so the serving path never waits on the sink. Used by the prediction log and the traffic capture.
+
+    A batch is flushed when it reaches `batch_size` records or when `flush_interval` seconds have passed.
+    If the sink fails or takes longer than `slow_sink_seconds`, batches are spilled to `spill_path` and
+    replayed once the sink recovers. Records are dropped, and counted, when the queue or the spill file is full.
+    """
+
+    def __init__(
+        self,
+        sink: RecordSink,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        spill_path: Optional[str] = None,
+        max_spill_bytes: int = 50 * 1024 * 1024,
+        slow_sink_seconds: float = 2.0,
+        retry_interval: float = 30.0,
+        name: str = 'batch-writer'
+    ):
+        self.sink = sink
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.max_spill_bytes = max_spill_bytes
+        self.slow_sink_seconds = slow_sink_seconds
+        self.retry_interval = retry_interval
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._degraded_until = 0.0
+        self._counters_lock = threading.Lock()
+        self._counters = {'enqueued': 0, 'written': 0, 'spilled': 0, 'replayed': 0, 'dropped': 0, 'sink_errors': 0}
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the background worker, flushing the records still in the queue.
+
+        Args:
+            timeout (float): maximum seconds to wait for the worker.
+        """
+
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def put(self, record: dict) -> bool:
+        """
+        Enqueue a record without blocking.
+
+        Args:
+            record (dict): record to write.
+
+        Returns:
+            bool: False if the record was dropped because the queue is full.
+        """
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._increment('dropped')
+            return False
+
+        self._increment('enqueued')
+        return True
+
+    def stats(self) -> dict:
+        with self._counters_lock:
+            stats = dict(self._counters)
+        stats['queued'] = self._queue.qsize()
+        stats['sink_degraded'] = time.monotonic() < self._degraded_until
+        return stats
+
+    def flush(self):
+        """Write everything currently queued. Runs on the caller's thread."""
+
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+            elif self._spill_pending():
+                self._replay_spill()
+        self.flush()
+
+    def _drain(self, block: bool) -> List[dict]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if not block or remaining <= 0 or self._stop_event.is_set():
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                continue
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.5)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _write(self, batch: List[dict]):
+        if time.monotonic() < self._degraded_until:
+            self._spill(batch)
+            return
+
+        start = time.monotonic()
+        try:
+            self.sink.write(batch)
+        except Exception as e:
+            logger.error(f'{self.name} sink failed, spilling {len(batch)} records: {str(e)}')
+            self._increment('sink_errors')
+            self._degraded_until = time.monotonic() + self.retry_interval
+            self._spill(batch)
+            return
+
+        self._increment('written', len(batch))
+        if time.monotonic() - start > self.slow_sink_seconds:
+            logger.warning(f'{self.name} sink is slow, spilling to disk for a while')
+            self._degraded_until = time.monotonic() + self.retry_interval
+        elif self._spill_pending():
+            self._replay_spill()
+
+    def _spill(self, batch: List[dict]):
+        if not self.spill_path:
+            self._increment('dropped', len(batch))
+            return
+
+        spill_size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+        if spill_size >= self.max_spill_bytes:
+            self._increment('dropped', len(batch))
+            return
+
+        append_rows(self.spill_path, batch)
+        self._increment('spilled', len(batch))
+
+    def _spill_pending(self) -> bool:
+        return bool(self.spill_path) and time.monotonic() >= self._degraded_until and os.path.exists(self.spill_path)
+
+    def _replay_spill(self):
+        replay_path = f'{self.spill_path}.replay'
+        os.replace(self.spill_path, replay_path)
+
+        with open(replay_path, 'r') as file:
+            rows = [json.loads(line) for line in file if line.strip()]
+        os.remove(replay_path)
+
+        for index in range(0, len(rows), self.batch_size):
+            batch = rows[index:index + self.batch_size]
+            try:
+                self.sink.write(batch)
+            except Exception as e:
+                logger.error(f'{self.name} sink failed while replaying spilled records: {str(e)}')
+                self._increment('sink_errors')
+                self._degraded_until = time.monotonic() + self.retry_interval
+                append_rows(self.spill_path, rows[index:])
+                return
+            self._increment('replayed', len(batch))
+
+    def _increment(self, counter: str, value: int = 1):
+        with self._counters_lock:
+            self._counters[counter] += value
+
+
+def append_rows(file_path: str, rows: List[dict]):
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, 'a') as file:
+        for row in rows:
+            file.write(json.dumps(row) + '\n')
@@ -0,0 +1,152 @@
+import math
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+DRIFT_FEATURES = ['OPERA', 'TIPOVUELO', 'MES']
+
+
+def compute_distribution(data: pd.DataFrame) -> dict:
+    """
+    Share of each value of the drift features in a dataset.
+
+    Args:
+        data (pd.DataFrame): raw data with the OPERA, TIPOVUELO and MES columns.
+
+    Returns:
+        dict: {feature: {value: share}}, values as strings.
+    """
+
+    return {
+        feature: {str(value): float(share) for value, share in data[feature].value_counts(normalize=True).items()}
+        for feature in DRIFT_FEATURES
+    }
+
+
+def jensen_shannon(reference: dict, current: dict) -> float:
+    """
+    Jensen-Shannon divergence (base 2, between 0 and 1) of two distributions given as {value: share}.
+    """
+
+    divergence = 0.0
+    for value in set(reference) | set(current):
+        p = reference.get(value, 0.0)
+        q = current.get(value, 0.0)
+        m = (p + q) / 2
+        if p > 0:
+            divergence += 0.5 * p * math.log2(p / m)
+        if q > 0:
+            divergence += 0.5 * q * math.log2(q / m)
+    return divergence
+
+
+class DriftMonitor:
+    """
+    Running counts of the drift features and of the predicted delays over a sliding window.
+
+    The window is made of `window_buckets` buckets of `bucket_seconds` each. Totals are kept up to date
+    incrementally as buckets enter and leave the window, so memory is bounded by the number of buckets times
+    the number of distinct feature values, and reports never scan past observations.
+    """
+
+    def __init__(self, bucket_seconds: int = 300, window_buckets: int = 12,
+                 clock: Callable[[], float] = time.monotonic):
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets = deque()
+        self._totals = self._empty_counts()
+
+    @staticmethod
+    def _empty_counts() -> dict:
+        counts = {feature: Counter() for feature in DRIFT_FEATURES}
+        counts['rows'] = 0
+        counts['delays'] = 0
+        return counts
+
+    def observe(self, flights: List[dict], predictions: List[int]):
+        """
+        Add a served request to the current bucket.
+
+        Args:
+            flights (List[dict]): flights with the OPERA, TIPOVUELO and MES keys.
+            predictions (List[int]): predicted classes, one per flight.
+        """
+
+        with self._lock:
+            bucket = self._current_bucket()
+            for flight in flights:
+                for feature in DRIFT_FEATURES:
+                    value = str(flight[feature])
+                    bucket[feature][value] += 1
+                    self._totals[feature][value] += 1
+            delays = sum(predictions)
+            bucket['rows'] += len(flights)
+            bucket['delays'] += delays
+            self._totals['rows'] += len(flights)
+            self._totals['delays'] += delays
+
+    def _current_bucket(self) -> dict:
+        index = int(self._clock() // self.bucket_seconds)
+        self._expire(index)
+        if not self._buckets or self._buckets[-1][0] != index:
+            self._buckets.append((index, self._empty_counts()))
+        return self._buckets[-1][1]
+
+    def _expire(self, index: int):
+        while self._buckets and self._buckets[0][0] <= index - self.window_buckets:
+            _, expired = self._buckets.popleft()
+            for feature in DRIFT_FEATURES:
+                self._totals[feature].subtract(expired[feature])
+                self._totals[feature] += Counter()
+            self._totals['rows'] -= expired['rows']
+            self._totals['delays'] -= expired['delays']
+
+    def current_distribution(self) -> dict:
+        with self._lock:
+            self._expire(int(self._clock() // self.bucket_seconds))
+            rows = self._totals['rows']
+            return {
+                'rows': rows,
+                'features': {
+                    feature: {value: count / rows for value, count in self._totals[feature].items()} if rows else {}
+                    for feature in DRIFT_FEATURES
+                },
+                'delay_rate': self._totals['delays'] / rows if rows else None
+            }
+
+    def divergence(self, snapshot: dict) -> dict:
+        """
+        Compare the current window against a training snapshot.
+
+        Args:
+            snapshot (dict): training distribution saved by DelayModel.fit.
+
+        Returns:
+            dict: Jensen-Shannon divergence per feature and the training vs serving predicted-delay rate.
+        """
+
+        current = self.current_distribution()
+        has_rows = current['rows'] > 0
+        scores = {
+            feature: jensen_shannon(snapshot['features'].get(feature, {}), current['features'][feature])
+            if has_rows else None
+            for feature in DRIFT_FEATURES
+        }
+        delay_rate: Optional[float] = current['delay_rate']
+        training_delay_rate = snapshot['predicted_delay_rate']
+
+        return {
+            'window_seconds': self.bucket_seconds * self.window_buckets,
+            'observations': current['rows'],
+            'divergence': scores,
+            'predicted_delay_rate': {
+                'training': training_delay_rate,
+                'serving': delay_rate,
+                'difference': delay_rate - training_delay_rate if delay_rate is not None else None
+            }
+        }
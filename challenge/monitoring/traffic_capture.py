@@ -0,0 +1,76 @@
+import os
+import random
+import time
+from typing import List
+
+from challenge.monitoring.batch_writer import BatchWriter, RecordSink, append_rows
+
+
+class RotatingFileSink(RecordSink):
+    """
+    Append records to a JSONL file, rotating it to `file_path.1` ... `file_path.<backup_count>` once it reaches
+    `max_bytes`. The oldest file is deleted.
+    """
+
+    def __init__(self, file_path: str, max_bytes: int, backup_count: int):
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def write(self, rows: List[dict]):
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path) >= self.max_bytes:
+            self._rotate()
+        append_rows(self.file_path, rows)
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f'{self.file_path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.file_path}.{index + 1}')
+        if self.backup_count > 0:
+            os.replace(self.file_path, f'{self.file_path}.1')
+        else:
+            os.remove(self.file_path)
+
+
+class TrafficCapture:
+    """
+    Samples request bodies with their arrival time for offline replay. Records go through a BatchWriter,
+    so capturing never blocks a request and drops records when the writer falls behind.
+
+    Requests are recorded after FastAPI has validated the body, so requests rejected with 400 or 413, or with a
+    malformed body, are never captured and a replay does not reproduce them.
+    """
+
+    def __init__(self, sink: RecordSink, sample_rate: float, max_queue_size: int = 10000):
+        self.sample_rate = sample_rate
+        self.writer = BatchWriter(sink=sink, max_queue_size=max_queue_size, batch_size=200, flush_interval=1.0,
+                                  name='traffic-capture')
+
+    def start(self):
+        self.writer.start()
+
+    def stop(self):
+        self.writer.stop()
+
+    def sampled(self) -> bool:
+        return random.random() < self.sample_rate
+
+    def record(self, endpoint: str, body: dict, arrival: float = None) -> bool:
+        """
+        Enqueue a request. Callers decide whether to record it with `sampled`, so unsampled requests cost nothing.
+
+        Args:
+            endpoint (str): path of the endpoint that received the request.
+            body (dict): request body.
+            arrival (float, optional): arrival unix timestamp, defaults to now.
+
+        Returns:
+            bool: False if the record was dropped.
+        """
+
+        return self.writer.put({'ts': arrival if arrival is not None else time.time(), 'endpoint': endpoint,
+                                'body': body})
+
+    def stats(self) -> dict:
+        return {'sample_rate': self.sample_rate, **self.writer.stats()}
@@ -1,8 +1,12 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException
 from pydantic import BaseModel, validator
 
+from challenge.settings import Settings
+
+settings = Settings()
+
 VALID_AIRLINES = [
     'Grupo LATAM',
     'Sky Airline',
@@ -29,6 +33,10 @@ VALID_AIRLINES = [
     'Plus Ultra Lineas Aereas'
 ]
 
+VALID_FLIGHT_TYPES = ['N', 'I']
+
+VALID_MONTHS = list(range(1, 13))
+
 
 class FlightTemplate(BaseModel):
     OPERA: str
@@ -43,19 +51,33 @@ class FlightTemplate(BaseModel):
 
     @validator('TIPOVUELO')
     def validate_type(cls, flight_type):
-        if flight_type not in ['N', 'I']:
+        if flight_type not in VALID_FLIGHT_TYPES:
             raise HTTPException(status_code=400, detail='Invalid TIPOVUELO. Must be N or I.')
         return flight_type
 
     @validator('MES')
     def validate_month(cls, month):
-        if month < 1 or month > 12:
+        if month not in VALID_MONTHS:
             raise HTTPException(status_code=400, detail='Invalid MES. Must be between 1 and 12.')
         return month
 
 
 class RequestTemplate(BaseModel):
     flights: List[FlightTemplate]
+    model_id: Optional[str] = None
+
+    @validator('flights')
+    def validate_flights(cls, flights):
+        if len(flights) > settings.MAX_FLIGHTS_PER_REQUEST:
+            raise HTTPException(status_code=413,
+                                detail=f'Too many flights. Must be at most {settings.MAX_FLIGHTS_PER_REQUEST}.')
+        return flights
+
+    @validator('model_id')
+    def validate_model_id(cls, model_id):
+        if model_id is not None and model_id.endswith('.pkl'):
+            raise HTTPException(status_code=400, detail='Model id should not have extension')
+        return model_id
 
 
 class FitRequestTemplate(BaseModel):
@@ -0,0 +1,28 @@
+import threading
+from typing import Dict, Optional
+
+from challenge.monitoring.drift import DriftMonitor
+from challenge.settings import Settings
+
+settings = Settings()
+
+drift_monitors: Dict[Optional[str], DriftMonitor] = {}
+drift_monitors_lock = threading.Lock()
+
+
+def get_drift_monitor(model_id: Optional[str]) -> DriftMonitor:
+    """
+    Serving traffic is tracked per model, so each model is only compared against its own training snapshot.
+
+    Args:
+        model_id (str, optional): id of the model that served the traffic.
+
+    Returns:
+        DriftMonitor: the monitor of that model, created on first use.
+    """
+
+    with drift_monitors_lock:
+        if model_id not in drift_monitors:
+            drift_monitors[model_id] = DriftMonitor(bucket_seconds=settings.DRIFT_BUCKET_SECONDS,
+                                                    window_buckets=settings.DRIFT_WINDOW_BUCKETS)
+        return drift_monitors[model_id]
@@ -0,0 +1,122 @@
+import pickle
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from challenge.model import DelayModel
+
+
+class ModelPool:
+    """
+    Keeps several loaded models resident, evicting the least recently used ones when the estimated size of the
+    resident models exceeds `memory_budget_bytes`. The size of a model is estimated by its pickled size.
+
+    Loading a model that is not resident runs `loader` once, outside the pool lock: concurrent requests for the
+    same model wait for that load, and requests for other models are not blocked by it.
+    """
+
+    def __init__(self, loader: Callable[[str], Tuple[DelayModel, int]], memory_budget_bytes: int):
+        self._loader = loader
+        self.memory_budget_bytes = memory_budget_bytes
+        self._lock = threading.Lock()
+        self._models: OrderedDict = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._used_bytes = 0
+        self._counters = {'hits': 0, 'misses': 0, 'loads': 0, 'load_errors': 0, 'evictions': 0}
+
+    def get(self, model_id: str) -> DelayModel:
+        """
+        Return a resident model, loading it if needed.
+
+        Args:
+            model_id (str): id of the model, without extension.
+
+        Returns:
+            DelayModel: the loaded model.
+        """
+
+        with self._lock:
+            if model_id in self._models:
+                self._models.move_to_end(model_id)
+                self._counters['hits'] += 1
+                return self._models[model_id][0]
+
+            self._counters['misses'] += 1
+            future = self._loading.get(model_id)
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self._loading[model_id] = future
+
+        if not is_loader:
+            return future.result()
+
+        try:
+            delay_model, size = self._loader(model_id)
+        except Exception as e:
+            with self._lock:
+                self._counters['load_errors'] += 1
+                del self._loading[model_id]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._counters['loads'] += 1
+            self._insert(model_id, delay_model, size)
+            del self._loading[model_id]
+        future.set_result(delay_model)
+        return delay_model
+
+    def peek(self, model_id: str) -> Optional[DelayModel]:
+        with self._lock:
+            entry = self._models.get(model_id)
+            return entry[0] if entry else None
+
+    def put(self, model_id: str, delay_model: DelayModel, size: int = None):
+        if size is None:
+            size = len(pickle.dumps(delay_model._model))
+        with self._lock:
+            self._insert(model_id, delay_model, size)
+
+    def _insert(self, model_id: str, delay_model: DelayModel, size: int):
+        if model_id in self._models:
+            self._used_bytes -= self._models.pop(model_id)[1]
+
+        while self._models and self._used_bytes + size > self.memory_budget_bytes:
+            _, (_, evicted_size) = self._models.popitem(last=False)
+            self._used_bytes -= evicted_size
+            self._counters['evictions'] += 1
+
+        self._models[model_id] = (delay_model, size)
+        self._used_bytes += size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'resident': [{'model_id': model_id, 'size_mb': size / 1024 ** 2}
+                             for model_id, (_, size) in self._models.items()],
+                'loading': list(self._loading),
+                'used_mb': self._used_bytes / 1024 ** 2,
+                'memory_budget_mb': self.memory_budget_bytes / 1024 ** 2,
+                **self._counters
+            }
+
+
+def parse_routes(routes: str) -> Dict[str, float]:
+    """
+    Parse weighted routes as configured in Settings, e.g. 'model_a:90,model_b:10'.
+    """
+
+    parsed = {}
+    for route in filter(None, (route.strip() for route in routes.split(','))):
+        model_id, weight = route.rsplit(':', 1)
+        parsed[model_id.strip()] = float(weight)
+    return parsed
+
+
+def choose_route(routes: Dict[str, float]) -> Optional[str]:
+    if not routes:
+        return None
+    return random.choices(list(routes), weights=list(routes.values()))[0]
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import List, Optional
+
+from challenge.monitoring.batch_writer import BatchWriter, BigQueryRecordSink, FileRecordSink, RecordSink
+from challenge.schemas.templates import FlightTemplate
+from challenge.settings import Settings
+
+settings = Settings()
+
+
+def get_prediction_sink() -> RecordSink:
+    if settings.PREDICTION_LOG_SINK == 'file':
+        return FileRecordSink(file_path=settings.PREDICTION_LOG_FILE_PATH)
+    return BigQueryRecordSink(project_id=settings.project_id, dataset_id=settings.dataset_id,
+                              table_id=settings.PREDICTION_LOG_TABLE_ID)
+
+
+prediction_logger = BatchWriter(
+    sink=get_prediction_sink(),
+    max_queue_size=settings.PREDICTION_LOG_QUEUE_SIZE,
+    batch_size=settings.PREDICTION_LOG_BATCH_SIZE,
+    flush_interval=settings.PREDICTION_LOG_FLUSH_INTERVAL,
+    spill_path=settings.PREDICTION_LOG_SPILL_PATH,
+    name='prediction-log'
+)
+
+
+def start_prediction_log():
+    if settings.PREDICTION_LOG_ENABLED:
+        prediction_logger.start()
+
+
+def stop_prediction_log():
+    if settings.PREDICTION_LOG_ENABLED:
+        prediction_logger.stop()
+
+
+def log_prediction(data: List[FlightTemplate], predictions: Optional[list], probabilities: Optional[list],
+                   model_id: Optional[str], latency_ms: float, cached: bool = False):
+    """
+    Enqueue one record per flight for the prediction log. Never blocks; see BatchWriter.
+
+    Args:
+        data (List[FlightTemplate]): flights received in the request.
+        predictions (list, optional): predicted classes, one per flight.
+        probabilities (list, optional): predicted class probabilities, one per flight.
+        model_id (str, optional): id of the model that served the request.
+        latency_ms (float): time spent serving the whole request.
+        cached (bool): whether the result came from the prediction cache.
+    """
+
+    if not settings.PREDICTION_LOG_ENABLED:
+        return
+
+    served_at = datetime.utcnow().isoformat()
+    for index, flight in enumerate(data):
+        prediction_logger.put({
+            'served_at': served_at,
+            'model_id': model_id,
+            'opera': flight.OPERA,
+            'tipovuelo': flight.TIPOVUELO,
+            'mes': flight.MES,
+            'prediction': predictions[index] if predictions is not None else None,
+            'probability': probabilities[index][1] if probabilities is not None else None,
+            'latency_ms': latency_ms,
+            'batch_size': len(data),
+            'cached': cached
+        })
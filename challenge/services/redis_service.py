@@ -1,6 +1,6 @@
 import hashlib
 import json
-from typing import List
+from typing import List, Optional
 
 from challenge.redis.redis_client import get_redis_connection
 from challenge.schemas.templates import FlightTemplate
@@ -11,9 +11,9 @@ settings = Settings()
 redis_client = get_redis_connection(redis_host=settings.REDIS_HOST, redis_port=settings.REDIS_PORT)
 
 
-def generate_request_key(data: List[FlightTemplate]):
+def generate_request_key(data: List[FlightTemplate], model_id: Optional[str] = None):
     request_dicts = [item.dict() for item in data]
-    request_str = json.dumps(request_dicts, sort_keys=True)
+    request_str = json.dumps({'model_id': model_id, 'flights': request_dicts}, sort_keys=True)
     return hashlib.md5(request_str.encode()).hexdigest()
 
 
@@ -1,16 +1,20 @@
 import os
 import pickle
-from typing import List
+import time
+from typing import List, Optional, Tuple
 
 import pandas as pd
 from fastapi import HTTPException
 
 from challenge.db.db_functions import save_metrics_to_bigquery
 from challenge.model import DelayModel
-from challenge.schemas.templates import FlightTemplate
+from challenge.schemas.templates import FlightTemplate, VALID_AIRLINES, VALID_FLIGHT_TYPES, VALID_MONTHS
+from challenge.services.drift_service import get_drift_monitor
+from challenge.services.model_pool import ModelPool, choose_route, parse_routes
+from challenge.services.prediction_log_service import log_prediction
 from challenge.services.redis_service import cache_prediction, generate_request_key, get_cached_prediction
 from challenge.settings import Settings
-from challenge.storage.storage_functions import save_model_in_storage, get_file, get_training_data, get_trained_model
+from challenge.storage.storage_functions import save_model_in_storage, get_file, get_training_data, get_last_file
 from challenge.utils.logger import get_logger
 from challenge.utils.utils import load_data_from_csv
 
@@ -19,22 +23,96 @@ model = DelayModel()
 logger = get_logger()
 
 
+def load_pool_model(model_id: str) -> Tuple[DelayModel, int]:
+    trained_model = get_file(file_name=f'{model_id}.pkl', bucket_name=settings.MODELS_BUCKET_NAME)
+    if not trained_model:
+        raise HTTPException(status_code=404, detail=f'Model {model_id} does not exist in the bucket.')
+
+    pool_model = DelayModel()
+    pool_model.load_model(model=pickle.loads(trained_model), model_id=model_id)
+    logger.info(f'Model {model_id} loaded in the model pool')
+    return pool_model, len(trained_model)
+
+
+model_pool = ModelPool(loader=load_pool_model, memory_budget_bytes=settings.MODEL_POOL_MEMORY_MB * 1024 ** 2)
+model_routes = parse_routes(settings.MODEL_ROUTES)
+
+
+def swap_model(new_model: DelayModel):
+    """
+    Make `new_model` the current model with a single assignment. Requests that already selected the previous
+    model keep using that object, which is never mutated, and it stays resident in the pool so rolling back to
+    it does not download it again.
+
+    Args:
+        new_model (DelayModel): fully loaded model to serve.
+    """
+
+    global model
+    previous_model = model
+    model = new_model
+
+    if previous_model is not new_model and previous_model._model is not None and previous_model.model_id is not None:
+        model_pool.put(model_id=previous_model.model_id, delay_model=previous_model)
+
+
+def select_model(model_id: Optional[str] = None) -> DelayModel:
+    """
+    Choose the model that serves a request: the requested one, else one picked by the weighted routes, else the
+    current model. Only the current model, routed models and models already resident in the pool can be
+    requested, so a request never triggers a load from the bucket for an arbitrary id.
+
+    Args:
+        model_id (str, optional): id of the model requested, without extension.
+
+    Returns:
+        DelayModel: the selected model.
+    """
+
+    current_model = model
+    if model_id is None:
+        model_id = choose_route(model_routes)
+
+    if model_id is None or model_id == current_model.model_id:
+        return current_model
+
+    if model_id not in model_routes and model_pool.peek(model_id) is None:
+        raise HTTPException(status_code=404, detail=f'Model {model_id} is not routed nor resident in the pool.')
+
+    return model_pool.get(model_id)
+
+
 def train_model(bucket_name: str, cloud_data: bool) -> str:
+    """
+    Train a new model and serve it once it is saved in the bucket. Training never touches the current model,
+    which keeps serving until the swap and then stays resident in the pool.
+
+    Args:
+        bucket_name (str): bucket with the training data.
+        cloud_data (bool): whether to read the training data from the bucket instead of ./data/data.csv.
+
+    Returns:
+        str: file name of the new model in the models bucket.
+    """
+
     if cloud_data:
         last_file_data = get_training_data(bucket_name=bucket_name)
         data = load_data_from_csv(csv_data=last_file_data, cloud_data=cloud_data)
     else:
         data = load_data_from_csv(csv_data='./data/data.csv', cloud_data=cloud_data)
 
-    features, target = model.preprocess(data=data, target_column='delay')
+    new_model = DelayModel()
+    features, target = new_model.preprocess(data=data, target_column='delay')
     logger.info('Preprocess finished')
-    metrics, training_model = model.fit(features=features, target=target)
+    metrics, training_model = new_model.fit(features=features, target=target)
     logger.info('Fit finished')
 
-    with open('./models/model.pkl', 'wb') as file:
-        pickle.dump(model, file)
-
     file_name = save_model_in_storage(model=training_model, bucket_name=settings.MODELS_BUCKET_NAME)
+    new_model.model_id = file_name.replace('.pkl', '')
+
+    with open('./models/model.pkl', 'wb') as file:
+        pickle.dump(new_model, file)
+    swap_model(new_model)
 
     save_metrics_to_bigquery(metrics=metrics, project_id=settings.project_id, dataset_id=settings.dataset_id,
                              table_id=settings.table_id, model_id=file_name)
@@ -42,19 +120,29 @@ def train_model(bucket_name: str, cloud_data: bool) -> str:
     return file_name
 
 
-def predict_service(data: List[FlightTemplate]) -> list:
+def predict_service(data: List[FlightTemplate], delay_model: Optional[DelayModel] = None) -> list:
+    start = time.perf_counter()
+    delay_model = delay_model or model
 
-    request_key = generate_request_key(data=data)
+    request_key = generate_request_key(data=data, model_id=delay_model.model_id)
     cached_result = get_cached_prediction(request_key)
     if cached_result:
+        get_drift_monitor(delay_model.model_id).observe(flights=[flight.__dict__ for flight in data],
+                                                        predictions=cached_result)
+        log_prediction(data=data, predictions=cached_result, probabilities=None, model_id=delay_model.model_id,
+                       latency_ms=(time.perf_counter() - start) * 1000, cached=True)
         return cached_result
 
-    data = [flight.__dict__ for flight in data]
-    features = pd.DataFrame(data)
-    features = model.preprocess(data=features)
+    flights = [flight.__dict__ for flight in data]
+    features = pd.DataFrame(flights)
+    features = delay_model.preprocess(data=features)
 
-    predictions = model.predict(features=features)
+    predictions = delay_model.predict(features=features)
     cache_prediction(key=request_key, result=predictions)
+    get_drift_monitor(delay_model.model_id).observe(flights=flights, predictions=predictions)
+
+    log_prediction(data=data, predictions=predictions, probabilities=None, model_id=delay_model.model_id,
+                   latency_ms=(time.perf_counter() - start) * 1000)
 
     return predictions
 
@@ -63,41 +151,130 @@ def update_model(model_name: str = None, cloud: bool = False):
     file_path = './models/model.pkl'
     if not os.path.exists(file_path) or cloud:
         if model_name:
-            trained_model = get_file(file_name=model_name, bucket_name=settings.MODELS_BUCKET_NAME)
-
-            if trained_model:
-                model_trained = pickle.loads(trained_model)
-                model.load_model(model=model_trained)
-
-                with open('./models/model.pkl', 'wb') as file:
-                    pickle.dump(model, file)
-                return 'Success'
-            else:
-                raise HTTPException(status_code=404, detail=f'Model {model_name} does not exist in the bucket.')
-
-        last_model = get_trained_model(bucket_name=settings.MODELS_BUCKET_NAME)
-        if last_model:
-            model_trained = pickle.loads(last_model)
-            model.load_model(model=model_trained)
-
-            with open('./models/model.pkl', 'wb') as file:
-                pickle.dump(model, file)
-            return 'Success'
+            model_id = model_name.replace('.pkl', '')
+            new_model = model_pool.peek(model_id)
+            if new_model is None:
+                trained_model = get_file(file_name=model_name, bucket_name=settings.MODELS_BUCKET_NAME)
+                if not trained_model:
+                    raise HTTPException(status_code=404, detail=f'Model {model_name} does not exist in the bucket.')
+
+                new_model = DelayModel()
+                new_model.load_model(model=pickle.loads(trained_model), model_id=model_id)
         else:
-            raise HTTPException(status_code=404, detail='There are no models in the bucket.')
+            last_blob = get_last_file(bucket_name=settings.MODELS_BUCKET_NAME)
+            last_model = last_blob.download_as_string()
+            if not last_model:
+                raise HTTPException(status_code=404, detail='There are no models in the bucket.')
+
+            new_model = DelayModel()
+            new_model.load_model(model=pickle.loads(last_model), model_id=last_blob.name.replace('.pkl', ''))
 
-    with open('./models/model.pkl', 'rb') as saved_model:
+        with open(file_path, 'wb') as file:
+            pickle.dump(new_model, file)
+        swap_model(new_model)
+        return 'Success'
+
+    with open(file_path, 'rb') as saved_model:
         saved_model = pickle.load(saved_model)
-        model.load_model(model=saved_model)
+
+    new_model = DelayModel()
+    new_model.load_model(model=saved_model, model_id=getattr(saved_model, 'model_id', None))
+    swap_model(new_model)
     return 'Success'
 
 
-def predict_proba_service(data: List[FlightTemplate]) -> list:
+def predict_proba_service(data: List[FlightTemplate], delay_model: Optional[DelayModel] = None) -> list:
+    start = time.perf_counter()
+    delay_model = delay_model or model
 
-    data = [flight.__dict__ for flight in data]
-    features = pd.DataFrame(data)
-    features = model.preprocess(data=features)
+    flights = [flight.__dict__ for flight in data]
+    features = pd.DataFrame(flights)
+    features = delay_model.preprocess(data=features)
 
-    predictions = model.predict_proba(features=features)
+    predictions = delay_model.predict_proba(features=features)
+    predicted_classes = [int(proba[1] > 0.5) for proba in predictions]
+    get_drift_monitor(delay_model.model_id).observe(flights=flights, predictions=predicted_classes)
+
+    log_prediction(data=data, predictions=predicted_classes, probabilities=predictions,
+                   model_id=delay_model.model_id, latency_ms=(time.perf_counter() - start) * 1000)
 
     return predictions
+
+
+def warm_up(delay_model: Optional[DelayModel] = None) -> float:
+    """
+    Run synthetic batches covering every valid OPERA, TIPOVUELO and MES value through preprocess, predict,
+    predict_proba and the prediction cache, so the first real request does not pay for lazy initialization.
+    Nothing is recorded in the drift monitor or the prediction log.
+
+    Args:
+        delay_model (DelayModel, optional): model to warm up, defaults to the current model.
+
+    Returns:
+        float: warm-up duration in milliseconds.
+    """
+
+    start = time.perf_counter()
+    delay_model = delay_model or model
+    flights = [FlightTemplate(OPERA=airline, TIPOVUELO=flight_type, MES=month)
+               for airline in VALID_AIRLINES for flight_type in VALID_FLIGHT_TYPES for month in VALID_MONTHS]
+
+    for batch in (flights[:1], flights):
+        features = delay_model.preprocess(data=pd.DataFrame([flight.__dict__ for flight in batch]))
+        predictions = delay_model.predict(features=features)
+        delay_model.predict_proba(features=features)
+
+        try:
+            request_key = generate_request_key(data=batch, model_id=delay_model.model_id)
+            if get_cached_prediction(request_key) is None:
+                cache_prediction(key=request_key, result=predictions)
+        except Exception as e:
+            logger.warning(f'Prediction cache warm-up failed: {str(e)}')
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    logger.info(f'Warm-up of model {delay_model.model_id} finished in {duration_ms:.0f} ms')
+    return duration_ms
+
+
+def warm_up_models() -> dict:
+    """
+    Warm up the current model and every model in the weighted routes, loading the routed models into the pool,
+    so traffic sent to any of them does not pay for the download or lazy initialization.
+
+    Returns:
+        dict: warm-up duration in milliseconds per model id.
+    """
+
+    durations = {}
+    for delay_model in [model] + [select_model(model_id) for model_id in model_routes]:
+        if delay_model.model_id not in durations:
+            durations[delay_model.model_id] = warm_up(delay_model)
+    return durations
+
+
+def drift_service(model_id: Optional[str] = None) -> dict:
+    """
+    Compare the serving traffic of a model with its training distribution snapshot.
+
+    Args:
+        model_id (str, optional): id of a resident model, defaults to the current model.
+
+    Returns:
+        dict: divergence report of that model.
+    """
+
+    current_model = model
+    if model_id is None or model_id == current_model.model_id:
+        delay_model = current_model
+    else:
+        delay_model = model_pool.peek(model_id)
+        if delay_model is None:
+            raise HTTPException(status_code=404, detail=f'Model {model_id} is not loaded.')
+
+    snapshot = delay_model.training_snapshot
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f'Model {delay_model.model_id} has no training snapshot.')
+
+    report = get_drift_monitor(delay_model.model_id).divergence(snapshot=snapshot)
+    report['model_id'] = delay_model.model_id
+    return report
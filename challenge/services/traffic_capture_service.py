@@ -0,0 +1,26 @@
+from challenge.monitoring.traffic_capture import RotatingFileSink, TrafficCapture
+from challenge.schemas.templates import RequestTemplate
+from challenge.settings import Settings
+
+settings = Settings()
+
+traffic_capture = TrafficCapture(
+    sink=RotatingFileSink(file_path=settings.TRAFFIC_CAPTURE_PATH, max_bytes=settings.TRAFFIC_CAPTURE_MAX_BYTES,
+                          backup_count=settings.TRAFFIC_CAPTURE_BACKUPS),
+    sample_rate=settings.TRAFFIC_CAPTURE_SAMPLE_RATE
+)
+
+
+def start_traffic_capture():
+    if settings.TRAFFIC_CAPTURE_ENABLED:
+        traffic_capture.start()
+
+
+def stop_traffic_capture():
+    if settings.TRAFFIC_CAPTURE_ENABLED:
+        traffic_capture.stop()
+
+
+def capture_request(endpoint: str, data: RequestTemplate, arrival: float):
+    if settings.TRAFFIC_CAPTURE_ENABLED and traffic_capture.sampled():
+        traffic_capture.record(endpoint=endpoint, body=data.dict(exclude_none=True), arrival=arrival)
@@ -8,9 +8,48 @@ class Settings(BaseSettings):
 
     MODELS_BUCKET_NAME: str = ''
     DELAY_THRESHOLD: int = 15
+    FEATURE_PIPELINE: str = 'one_hot'
+
+    TRAIN_N_ESTIMATORS: int = 100
+    TRAIN_LEARNING_RATE: float = 0.01
+    TRAIN_TREE_METHOD: str = 'hist'
+    TRAIN_N_JOBS: int = 0  # 0 uses the container CPU quota, see available_cpus
+    TRAIN_VALIDATION_SIZE: float = 0  # share of the training split held out for early stopping, 0 disables it
+    TRAIN_EARLY_STOPPING_ROUNDS: int = 20
+    TRAIN_TIME_BUDGET_SECONDS: float = 0  # 0 disables the budget
+
+    MODEL_POOL_MEMORY_MB: int = 512
+    MODEL_ROUTES: str = ''
+
+    MAX_FLIGHTS_PER_REQUEST: int = 1000
+    ADMISSION_SMALL_REQUEST_FLIGHTS: int = 10
+    ADMISSION_PREDICT_CONCURRENCY: int = 4
+    ADMISSION_PREDICT_QUEUE_SIZE: int = 64
+    ADMISSION_PREDICT_MAX_WAIT_SECONDS: float = 1.0
+    ADMISSION_FIT_CONCURRENCY: int = 1
+    ADMISSION_FIT_QUEUE_SIZE: int = 0
+    ADMISSION_FIT_MAX_WAIT_SECONDS: float = 0.0
     project_id: str = ''
     dataset_id: str = ''
     table_id: str = ''
 
     REDIS_HOST: str = ""
     REDIS_PORT: int = 6379
+
+    PREDICTION_LOG_ENABLED: bool = False
+    PREDICTION_LOG_SINK: str = 'bigquery'
+    PREDICTION_LOG_TABLE_ID: str = 'predictions'
+    PREDICTION_LOG_FILE_PATH: str = './logs/predictions.jsonl'
+    PREDICTION_LOG_SPILL_PATH: str = './logs/predictions_spill.jsonl'
+    PREDICTION_LOG_QUEUE_SIZE: int = 10000
+    PREDICTION_LOG_BATCH_SIZE: int = 500
+    PREDICTION_LOG_FLUSH_INTERVAL: float = 5.0
+
+    DRIFT_BUCKET_SECONDS: int = 300
+    DRIFT_WINDOW_BUCKETS: int = 12
+
+    TRAFFIC_CAPTURE_ENABLED: bool = False
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 0.1
+    TRAFFIC_CAPTURE_PATH: str = './captures/traffic.jsonl'
+    TRAFFIC_CAPTURE_MAX_BYTES: int = 50 * 1024 * 1024
+    TRAFFIC_CAPTURE_BACKUPS: int = 5
@@ -59,17 +59,8 @@ def get_file(file_name, bucket_name):
     client = storage.Client()
 
     try:
-        bucket = client.get_bucket(bucket_name)
-        blobs = bucket.list_blobs()
-
-        if not blobs:
-            return None
-
-        for blob in blobs:
-            if blob.name == file_name:
-                return blob.download_as_string()
-
-        return None
+        blob = client.bucket(bucket_name).get_blob(file_name)
+        return blob.download_as_string() if blob else None
 
     except Exception as e:
         print(e)
@@ -0,0 +1,120 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+
+class AdmissionController:
+    """
+    Bounds the concurrent work of one endpoint.
+
+    Up to `max_concurrency` requests run at once. Others wait in a queue of at most `max_queue_size` requests,
+    served by priority (lower first) and then by arrival. A request is rejected with 429 and Retry-After when the
+    queue is full, when its estimated wait already exceeds `max_wait_seconds`, or when it waited that long
+    without being admitted.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue_size: int, max_wait_seconds: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_wait_seconds = max_wait_seconds
+        self._active = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._service_seconds = 0.0
+        self._wait_seconds = deque(maxlen=1000)
+        self._counters = {'admitted': 0, 'shed_queue_full': 0, 'shed_deadline': 0, 'shed_timeout': 0}
+
+    @asynccontextmanager
+    async def admit(self, priority: int = 0):
+        arrival = time.monotonic()
+        await self._acquire(priority)
+        admitted_at = time.monotonic()
+        self._wait_seconds.append(admitted_at - arrival)
+        self._counters['admitted'] += 1
+        try:
+            yield
+        finally:
+            self._observe_service_time(time.monotonic() - admitted_at)
+            self._release()
+
+    def estimated_wait(self, priority: int = 0) -> float:
+        ahead = sum(1 for waiter in self._waiters if waiter[0] <= priority)
+        return (ahead + 1) * self._service_seconds / self.max_concurrency
+
+    async def _acquire(self, priority: int):
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            return
+
+        if len(self._waiters) >= self.max_queue_size:
+            self._shed('shed_queue_full', self.estimated_wait(priority))
+
+        estimated_wait = self.estimated_wait(priority)
+        if estimated_wait > self.max_wait_seconds:
+            self._shed('shed_deadline', estimated_wait)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await asyncio.wait({future}, timeout=self.max_wait_seconds)
+        except asyncio.CancelledError:
+            if future.done():
+                self._release()
+            else:
+                self._remove_waiter(waiter)
+            raise
+
+        if not future.done():
+            self._remove_waiter(waiter)
+            self._shed('shed_timeout', self.estimated_wait(priority))
+
+    def _remove_waiter(self, waiter: tuple):
+        waiter[2].cancel()
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+
+    def _release(self):
+        if self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            # The slot is handed over to the waiter, so the active count does not change.
+            future.set_result(None)
+            return
+        self._active -= 1
+
+    def _observe_service_time(self, seconds: float):
+        if self._service_seconds == 0.0:
+            self._service_seconds = seconds
+        else:
+            self._service_seconds = 0.9 * self._service_seconds + 0.1 * seconds
+
+    def _shed(self, reason: str, estimated_wait: float):
+        self._counters[reason] += 1
+        retry_after = max(1, math.ceil(estimated_wait))
+        raise HTTPException(status_code=429, detail=f'Too many {self.name} requests, retry later.',
+                            headers={'Retry-After': str(retry_after)})
+
+    def stats(self) -> dict:
+        waits = sorted(self._wait_seconds)
+
+        def percentile(value: float) -> float:
+            return waits[min(len(waits) - 1, int(value * len(waits)))] * 1000 if waits else 0.0
+
+        return {
+            'active': self._active,
+            'queued': len(self._waiters),
+            'max_concurrency': self.max_concurrency,
+            'max_queue_size': self.max_queue_size,
+            'service_ms': self._service_seconds * 1000,
+            'wait_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0)},
+            **self._counters
+        }
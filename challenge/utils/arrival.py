@@ -0,0 +1,16 @@
+import time
+
+
+class ArrivalTimeMiddleware:
+    """
+    Store the unix time a request arrived in `request.state.arrival`, before the body is read and validated,
+    so captured traffic keeps the real inter-arrival gaps. Plain ASGI, so it adds no per-request task.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            scope.setdefault('state', {})['arrival'] = time.time()
+        await self.app(scope, receive, send)
@@ -0,0 +1,57 @@
+import math
+import os
+import time
+from typing import Optional
+
+from xgboost.callback import TrainingCallback
+
+
+class TimeBudgetCallback(TrainingCallback):
+    """
+    Stop boosting once `seconds` of wall-clock time have been spent. Trees built so far are kept, and
+    with early stopping the best iteration found within the budget is the one used to predict.
+    """
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+        self.stopped = False
+        self._start = None
+
+    def before_training(self, model):
+        self._start = time.monotonic()
+        self.stopped = False
+        return model
+
+    def after_iteration(self, model, epoch: int, evals_log) -> bool:
+        if time.monotonic() - self._start >= self.seconds:
+            self.stopped = True
+        return self.stopped
+
+
+def available_cpus() -> int:
+    """
+    Number of CPUs the process may use: the container CPU quota when one is set, else the CPUs it is allowed
+    to run on. Cores visible on the host but outside the quota only add contention.
+    """
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    return max(1, min(cpus, math.ceil(quota))) if quota else cpus
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            quota, period = file.read().split()
+        return None if quota == 'max' else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as quota_file, \
+                open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as period_file:
+            quota, period = int(quota_file.read()), int(period_file.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from fastapi import HTTPException
+
+from challenge.utils.admission import AdmissionController
+
+
+class TestAdmissionController(unittest.TestCase):
+
+    def test_should_shed_when_queue_is_full(self):
+        async def scenario():
+            controller = AdmissionController(name='predict', max_concurrency=1, max_queue_size=0,
+                                             max_wait_seconds=1.0)
+            async with controller.admit():
+                with self.assertRaises(HTTPException) as context:
+                    async with controller.admit():
+                        pass
+            return controller, context.exception
+
+        controller, exception = asyncio.run(scenario())
+
+        assert exception.status_code == 429
+        assert int(exception.headers['Retry-After']) >= 1
+        assert controller.stats()['shed_queue_full'] == 1
+
+    def test_should_shed_after_max_wait(self):
+        async def scenario():
+            controller = AdmissionController(name='predict', max_concurrency=1, max_queue_size=4,
+                                             max_wait_seconds=0.05)
+            async with controller.admit():
+                with self.assertRaises(HTTPException):
+                    async with controller.admit():
+                        pass
+            return controller
+
+        controller = asyncio.run(scenario())
+
+        assert controller.stats()['shed_timeout'] == 1
+        assert controller.stats()['queued'] == 0
+        assert controller.stats()['active'] == 0
+
+    def test_should_admit_small_requests_first(self):
+        order = []
+
+        async def request(controller, name, priority):
+            async with controller.admit(priority=priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            controller = AdmissionController(name='predict', max_concurrency=1, max_queue_size=4,
+                                             max_wait_seconds=1.0)
+            first = asyncio.create_task(request(controller, 'first', 0))
+            await asyncio.sleep(0)
+            bulk = asyncio.create_task(request(controller, 'bulk', 1))
+            small = asyncio.create_task(request(controller, 'small', 0))
+            await asyncio.gather(first, bulk, small)
+            return controller
+
+        controller = asyncio.run(scenario())
+
+        assert order == ['first', 'small', 'bulk']
+        assert controller.stats()['admitted'] == 3
@@ -1,3 +1,4 @@
+import time
 import unittest
 
 import numpy as np
@@ -26,6 +27,7 @@ class TestBatchPipeline(unittest.TestCase):
         response = self.client.post("/predict", json=data)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"predict": [0]})
+        self.assertNotEqual(response.headers.get("X-Model-Id"), "None")
     
     def test_should_failed_unkown_column_1(self):
         data = {       
@@ -67,4 +69,29 @@ class TestBatchPipeline(unittest.TestCase):
         }
         when("xgboost.XGBClassifier").predict(ANY).thenReturn(np.array([0]))
         response = self.client.post("/predict", json=data)
-        self.assertEqual(response.status_code, 400)
\ No newline at end of file
+        self.assertEqual(response.status_code, 400)
+
+    def test_should_failed_too_many_flights(self):
+        data = {
+            "flights": [
+                {
+                    "OPERA": "Aerolineas Argentinas",
+                    "TIPOVUELO": "N",
+                    "MES": 3
+                }
+            ] * 1001
+        }
+        response = self.client.post("/predict", json=data)
+        self.assertEqual(response.status_code, 413)
+
+    def test_should_be_ready_after_warm_up(self):
+        when("redis.Redis").get(ANY).thenReturn(None)
+        when("redis.Redis").set(ANY, ANY).thenReturn(True)
+        with TestClient(app) as client:
+            for _ in range(50):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "READY"})
\ No newline at end of file
@@ -0,0 +1,25 @@
+import asyncio
+import unittest
+
+from challenge.utils.arrival import ArrivalTimeMiddleware
+
+
+class TestArrivalTimeMiddleware(unittest.TestCase):
+
+    def test_should_record_arrival_before_reading_body(self):
+        events = []
+
+        async def receive():
+            events.append('body')
+            return {'type': 'http.request', 'body': b'{}', 'more_body': False}
+
+        async def app(scope, receive, send):
+            events.append(('arrival', scope['state']['arrival']))
+            await receive()
+
+        scope = {'type': 'http'}
+        asyncio.run(ArrivalTimeMiddleware(app)(scope, receive, None))
+
+        assert events[0][0] == 'arrival'
+        assert events[1] == 'body'
+        assert scope['state']['arrival'] > 0
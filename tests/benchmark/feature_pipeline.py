@@ -0,0 +1,68 @@
+"""
+Compare the one-hot and the native categorical feature pipelines of DelayModel.
+
+Each pipeline runs in a fresh process so peak RSS is not shared between them.
+
+    python -m tests.benchmark.feature_pipeline --data ./data/data.csv --scale 10
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+import pandas as pd
+
+PIPELINES = ['one_hot', 'categorical']
+
+
+def run_pipeline(pipeline: str, data_path: str, scale: int) -> dict:
+    from challenge.model import DelayModel, settings
+
+    settings.FEATURE_PIPELINE = pipeline
+
+    data = pd.concat([pd.read_csv(data_path)] * scale, ignore_index=True)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    model = DelayModel()
+
+    start = time.perf_counter()
+    features, target = model.preprocess(data=data, target_column='delay')
+    preprocess_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report, _ = model.fit(features=features, target=target)
+    fit_seconds = time.perf_counter() - start
+
+    # ru_maxrss is reported in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'pipeline': pipeline,
+        'rows': len(data),
+        'feature_columns': features.shape[1],
+        'feature_mb': features.memory_usage(deep=True).sum() / 1024 ** 2,
+        'preprocess_s': preprocess_seconds,
+        'fit_s': fit_seconds,
+        'peak_rss_mb': peak_rss / 1024,
+        'peak_rss_over_data_mb': (peak_rss - baseline_rss) / 1024,
+        'f1_delay': report['1']['f1-score'],
+        'f1_macro': report['macro avg']['f1-score']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='./data/data.csv')
+    parser.add_argument('--scale', type=int, default=1, help='Repeat the dataset to simulate larger training sets.')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    for pipeline in PIPELINES:
+        with context.Pool(processes=1) as pool:
+            rows.append(pool.apply(run_pipeline, (pipeline, args.data, args.scale)))
+
+    print(pd.DataFrame(rows).set_index('pipeline').round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
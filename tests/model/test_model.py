@@ -1,9 +1,10 @@
+import pickle
 import unittest
 import pandas as pd
 
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
-from challenge.model import DelayModel
+from challenge.model import DelayModel, settings
 
 class TestModel(unittest.TestCase):
 
@@ -87,6 +88,88 @@ class TestModel(unittest.TestCase):
         assert report["1"]["f1-score"] > 0.30
 
 
+    def test_model_categorical_preprocess_for_serving(
+        self
+    ):
+        self.model.feature_pipeline = "categorical"
+        features = self.model.preprocess(
+            data=self.data
+        )
+
+        assert isinstance(features, pd.DataFrame)
+        assert list(features.columns) == ["OPERA", "TIPOVUELO", "MES"]
+        assert all(str(dtype) == "category" for dtype in features.dtypes)
+        assert list(features["MES"].cat.categories) == list(range(1, 13))
+
+
+    def test_model_categorical_fit_after_loading_model(
+        self
+    ):
+        with open("./models/model.pkl", "rb") as saved_model:
+            loaded_model = pickle.load(saved_model)
+        self.model.load_model(model=loaded_model)
+        assert self.model.feature_pipeline == "one_hot"
+
+        pipeline = settings.FEATURE_PIPELINE
+        settings.FEATURE_PIPELINE = "categorical"
+        try:
+            features, target = self.model.preprocess(
+                data=self.data,
+                target_column="delay"
+            )
+            _, trained_model = self.model.fit(
+                features=features,
+                target=target
+            )
+        finally:
+            settings.FEATURE_PIPELINE = pipeline
+
+        assert list(features.columns) == ["OPERA", "TIPOVUELO", "MES"]
+        assert trained_model.enable_categorical
+        assert self.model.feature_pipeline == "categorical"
+
+
+    def test_model_fit_reports_training(
+        self
+    ):
+        features, target = self.model.preprocess(
+            data=self.data,
+            target_column="delay"
+        )
+
+        report, _ = self.model.fit(
+            features=features,
+            target=target
+        )
+
+        training = report["training"]
+        assert 0 <= training["best_iteration"] < training["boosted_rounds"] <= training["n_estimators"]
+        assert training["fit_seconds"] > 0
+        assert training["stopped_by_time_budget"] is False
+
+
+    def test_model_fit_attaches_training_snapshot(
+        self
+    ):
+        features, target = self.model.preprocess(
+            data=self.data,
+            target_column="delay"
+        )
+
+        _, trained_model = self.model.fit(
+            features=features,
+            target=target
+        )
+
+        snapshot = trained_model.training_snapshot
+        assert set(snapshot) == {"features", "delay_rate", "predicted_delay_rate", "rows"}
+        assert set(snapshot["features"]) == {"OPERA", "TIPOVUELO", "MES"}
+        assert snapshot["rows"] == len(target)
+        assert 0 <= snapshot["delay_rate"] <= 1
+        assert self.model.training_snapshot == snapshot
+        assert pickle.loads(pickle.dumps(trained_model)).training_snapshot == snapshot
+
+
     def test_model_predict(
         self
     ):
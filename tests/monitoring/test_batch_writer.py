@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from challenge.monitoring.batch_writer import BatchWriter, FileRecordSink, RecordSink
+
+
+class FailingSink(RecordSink):
+
+    def __init__(self):
+        self.fail = True
+        self.rows = []
+
+    def write(self, rows):
+        if self.fail:
+            raise RuntimeError('sink unavailable')
+        self.rows.extend(rows)
+
+
+class TestBatchWriter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'predictions.jsonl')
+        self.spill_path = os.path.join(self.directory.name, 'spill.jsonl')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def read_rows(self, path):
+        with open(path) as file:
+            return [json.loads(line) for line in file]
+
+    def test_should_flush_batches_to_sink(self):
+        batch_writer = BatchWriter(sink=FileRecordSink(self.log_path), batch_size=2, flush_interval=0.1)
+        batch_writer.start()
+        for index in range(5):
+            assert batch_writer.put({'prediction': index})
+        batch_writer.stop()
+
+        assert [row['prediction'] for row in self.read_rows(self.log_path)] == [0, 1, 2, 3, 4]
+        assert batch_writer.stats()['written'] == 5
+
+    def test_should_drop_when_queue_is_full(self):
+        batch_writer = BatchWriter(sink=FileRecordSink(self.log_path), max_queue_size=2)
+
+        assert batch_writer.put({'prediction': 0})
+        assert batch_writer.put({'prediction': 1})
+        assert not batch_writer.put({'prediction': 2})
+        assert batch_writer.stats()['dropped'] == 1
+
+    def test_should_spill_and_replay_when_sink_fails(self):
+        sink = FailingSink()
+        batch_writer = BatchWriter(sink=sink, spill_path=self.spill_path, retry_interval=0.0)
+
+        batch_writer.put({'prediction': 0})
+        batch_writer.flush()
+
+        assert len(self.read_rows(self.spill_path)) == 1
+        assert batch_writer.stats()['spilled'] == 1
+
+        sink.fail = False
+        time.sleep(0.01)
+        batch_writer.put({'prediction': 1})
+        batch_writer.flush()
+
+        assert [row['prediction'] for row in sink.rows] == [1, 0]
+        assert not os.path.exists(self.spill_path)
+        assert batch_writer.stats()['replayed'] == 1
@@ -0,0 +1,70 @@
+import unittest
+
+import pandas as pd
+
+from challenge.monitoring.drift import DriftMonitor, compute_distribution, jensen_shannon
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDriftMonitor(unittest.TestCase):
+
+    SNAPSHOT = {
+        'features': {
+            'OPERA': {'Grupo LATAM': 0.5, 'Sky Airline': 0.5},
+            'TIPOVUELO': {'N': 1.0},
+            'MES': {'1': 1.0}
+        },
+        'delay_rate': 0.2,
+        'predicted_delay_rate': 0.5,
+        'rows': 4
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = FakeClock()
+        self.monitor = DriftMonitor(bucket_seconds=10, window_buckets=2, clock=self.clock)
+
+    def test_compute_distribution(self):
+        data = pd.DataFrame({'OPERA': ['Grupo LATAM', 'Grupo LATAM', 'Sky Airline', 'Copa Air'],
+                             'TIPOVUELO': ['N', 'N', 'I', 'N'],
+                             'MES': [1, 1, 1, 2]})
+
+        distribution = compute_distribution(data)
+
+        assert distribution['OPERA'] == {'Grupo LATAM': 0.5, 'Sky Airline': 0.25, 'Copa Air': 0.25}
+        assert distribution['MES'] == {'1': 0.75, '2': 0.25}
+
+    def test_jensen_shannon_bounds(self):
+        assert jensen_shannon({'a': 0.5, 'b': 0.5}, {'a': 0.5, 'b': 0.5}) == 0.0
+        assert jensen_shannon({'a': 1.0}, {'b': 1.0}) == 1.0
+
+    def test_should_not_drift_on_training_like_traffic(self):
+        flights = [{'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'N', 'MES': 1},
+                   {'OPERA': 'Sky Airline', 'TIPOVUELO': 'N', 'MES': 1}]
+        self.monitor.observe(flights=flights, predictions=[1, 0])
+
+        report = self.monitor.divergence(self.SNAPSHOT)
+
+        assert report['observations'] == 2
+        assert report['divergence'] == {'OPERA': 0.0, 'TIPOVUELO': 0.0, 'MES': 0.0}
+        assert report['predicted_delay_rate']['difference'] == 0.0
+
+    def test_should_expire_old_buckets(self):
+        self.monitor.observe(flights=[{'OPERA': 'Copa Air', 'TIPOVUELO': 'I', 'MES': 5}], predictions=[1])
+        assert self.monitor.divergence(self.SNAPSHOT)['divergence']['OPERA'] == 1.0
+
+        self.clock.now = 25
+        self.monitor.observe(flights=[{'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'N', 'MES': 1}], predictions=[0])
+        current = self.monitor.current_distribution()
+
+        assert current['rows'] == 1
+        assert current['features']['OPERA'] == {'Grupo LATAM': 1.0}
+        assert current['delay_rate'] == 0.0
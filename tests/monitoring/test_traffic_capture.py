@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+
+from challenge.monitoring.traffic_capture import RotatingFileSink, TrafficCapture
+
+
+class TestTrafficCapture(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.capture_path = os.path.join(self.directory.name, 'traffic.jsonl')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_should_rotate_capture_files(self):
+        sink = RotatingFileSink(file_path=self.capture_path, max_bytes=10, backup_count=2)
+
+        for index in range(4):
+            sink.write([{'ts': index}])
+
+        with open(self.capture_path) as file:
+            assert json.loads(file.readline()) == {'ts': 3}
+        with open(f'{self.capture_path}.2') as file:
+            assert json.loads(file.readline()) == {'ts': 1}
+        assert not os.path.exists(f'{self.capture_path}.3')
+
+    def test_should_record_arrival_and_body(self):
+        traffic_capture = TrafficCapture(sink=RotatingFileSink(self.capture_path, max_bytes=1024, backup_count=1),
+                                         sample_rate=1.0)
+        body = {'flights': [{'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'N', 'MES': 3}]}
+
+        assert traffic_capture.sampled()
+        traffic_capture.record(endpoint='/predict', body=body, arrival=1700000000.5)
+        traffic_capture.writer.flush()
+
+        with open(self.capture_path) as file:
+            assert json.loads(file.readline()) == {'ts': 1700000000.5, 'endpoint': '/predict', 'body': body}
+
+    def test_should_not_sample_when_disabled(self):
+        traffic_capture = TrafficCapture(sink=RotatingFileSink(self.capture_path, max_bytes=1024, backup_count=1),
+                                         sample_rate=0.0)
+
+        assert not any(traffic_capture.sampled() for _ in range(100))
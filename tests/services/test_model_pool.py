@@ -0,0 +1,63 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from challenge.model import DelayModel
+from challenge.services.model_pool import ModelPool, choose_route, parse_routes
+
+
+class TestModelPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.loaded = []
+        self.loaded_lock = threading.Lock()
+
+    def loader(self, model_id):
+        time.sleep(0.05)
+        with self.loaded_lock:
+            self.loaded.append(model_id)
+        delay_model = DelayModel()
+        delay_model.load_model(model=object(), model_id=model_id)
+        return delay_model, 40
+
+    def test_should_evict_least_recently_used_over_budget(self):
+        pool = ModelPool(loader=self.loader, memory_budget_bytes=100)
+
+        pool.get('a')
+        pool.get('b')
+        pool.get('a')
+        pool.get('c')
+
+        assert pool.peek('a') is not None
+        assert pool.peek('b') is None
+        assert pool.peek('c') is not None
+        assert pool.stats()['evictions'] == 1
+
+    def test_should_load_once_for_concurrent_requests(self):
+        pool = ModelPool(loader=self.loader, memory_budget_bytes=100)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(pool.get, ['a'] * 8))
+
+        assert self.loaded == ['a']
+        assert all(delay_model is models[0] for delay_model in models)
+
+    def test_should_not_keep_failed_loads(self):
+        def failing_loader(model_id):
+            raise RuntimeError('missing')
+
+        pool = ModelPool(loader=failing_loader, memory_budget_bytes=100)
+
+        with self.assertRaises(RuntimeError):
+            pool.get('a')
+        assert pool.stats()['loading'] == []
+        assert pool.stats()['load_errors'] == 1
+
+    def test_routes(self):
+        routes = parse_routes('model_a:90, model_b:10')
+
+        assert routes == {'model_a': 90.0, 'model_b': 10.0}
+        assert choose_route(routes) in routes
+        assert choose_route(parse_routes('')) is None
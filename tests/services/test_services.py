@@ -0,0 +1,105 @@
+import pickle
+import types
+import unittest
+
+from fastapi import HTTPException
+from mockito import ANY, unstub, verify, when
+
+from challenge.model import DelayModel
+from challenge.services import services
+from challenge.services.drift_service import get_drift_monitor
+
+
+class TestModelSwap(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.original_model = services.model
+
+    def tearDown(self) -> None:
+        services.model = self.original_model
+        unstub()
+        super().tearDown()
+
+    def build_model(self, model_id):
+        delay_model = DelayModel()
+        delay_model.load_model(model=object(), model_id=model_id)
+        return delay_model
+
+    def test_should_swap_without_mutating_selected_model(self):
+        services.model = self.build_model('model_a')
+        selected_model = services.select_model()
+
+        services.swap_model(self.build_model('model_b'))
+
+        assert selected_model.model_id == 'model_a'
+        assert services.select_model().model_id == 'model_b'
+        assert services.model_pool.peek('model_a') is selected_model
+
+    def test_should_not_load_unknown_models_per_request(self):
+        when(services).get_file(file_name=ANY, bucket_name=ANY).thenReturn(pickle.dumps({}))
+
+        with self.assertRaises(HTTPException) as context:
+            services.select_model('unknown_model')
+
+        assert context.exception.status_code == 404
+        verify(services, times=0).get_file(file_name=ANY, bucket_name=ANY)
+
+
+class TestWarmUpModels(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.original_routes = dict(services.model_routes)
+
+    def tearDown(self) -> None:
+        services.model_routes.clear()
+        services.model_routes.update(self.original_routes)
+        unstub()
+        super().tearDown()
+
+    def test_should_warm_up_every_routed_model(self):
+        services.model_routes.clear()
+        services.model_routes.update({'routed_model': 100.0})
+        when(services).get_file(file_name='routed_model.pkl', bucket_name=ANY).thenReturn(pickle.dumps({}))
+        when(services).warm_up(ANY).thenReturn(1.0)
+
+        durations = services.warm_up_models()
+
+        assert 'routed_model' in durations
+        assert services.model.model_id in durations
+        assert services.model_pool.peek('routed_model') is not None
+
+
+class TestDriftPerModel(unittest.TestCase):
+
+    def test_should_track_drift_per_model(self):
+        get_drift_monitor('model_a').observe(flights=[{'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'N', 'MES': 1}],
+                                             predictions=[1])
+
+        assert get_drift_monitor('model_a') is get_drift_monitor('model_a')
+        assert get_drift_monitor('model_a').current_distribution()['rows'] == 1
+        assert get_drift_monitor('model_b').current_distribution()['rows'] == 0
+
+    def test_drift_service_compares_current_model_with_its_snapshot(self):
+        trained_model = types.SimpleNamespace(training_snapshot={
+            'features': {'OPERA': {'Grupo LATAM': 1.0}, 'TIPOVUELO': {'N': 1.0}, 'MES': {'1': 1.0}},
+            'delay_rate': 0.2,
+            'predicted_delay_rate': 0.0,
+            'rows': 1
+        })
+        delay_model = DelayModel()
+        delay_model.load_model(model=pickle.loads(pickle.dumps(trained_model)), model_id='drift_model')
+        get_drift_monitor('drift_model').observe(flights=[{'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'N', 'MES': 1}],
+                                                 predictions=[0])
+
+        original_model = services.model
+        services.model = delay_model
+        try:
+            report = services.drift_service()
+        finally:
+            services.model = original_model
+
+        assert report['model_id'] == 'drift_model'
+        assert report['observations'] == 1
+        assert all(divergence == 0.0 for divergence in report['divergence'].values())
@@ -0,0 +1,107 @@
+"""
+Replay captured /predict and /predict-proba traffic against a running instance.
+
+Requests are sent at their original inter-arrival times divided by --speed, and latency is measured from the
+scheduled send time, so a slow server cannot hide queueing by delaying the load generator.
+
+    python -m tests.stress.replay --capture './captures/traffic.jsonl*' --host http://localhost:8080 --speed 2
+"""
+import argparse
+import glob
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+
+
+def load_capture(pattern: str, limit: int = None) -> List[dict]:
+    records = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path) as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    records.sort(key=lambda record: record['ts'])
+    return records[:limit] if limit else records
+
+
+def percentile(values: List[float], value: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(value * len(ordered)))]
+
+
+def send(session: requests.Session, host: str, record: dict, scheduled: float) -> dict:
+    try:
+        status = session.post(f'{host}{record["endpoint"]}', json=record['body'], timeout=30).status_code
+    except requests.RequestException:
+        status = 'error'
+    return {
+        'endpoint': record['endpoint'],
+        'status': status,
+        'flights': len(record['body'].get('flights', [])),
+        'latency_ms': (time.monotonic() - scheduled) * 1000
+    }
+
+
+def replay(records: List[dict], host: str, speed: float, workers: int) -> List[dict]:
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    first_ts = records[0]['ts']
+    start = time.monotonic()
+    futures = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for record in records:
+            scheduled = start + (record['ts'] - first_ts) / speed
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(send, session, host, record, scheduled))
+    return [future.result() for future in futures]
+
+
+def report(results: List[dict], elapsed: float):
+    by_endpoint = defaultdict(list)
+    for result in results:
+        by_endpoint[result['endpoint']].append(result)
+        by_endpoint['all'].append(result)
+
+    print(f'{len(results)} requests in {elapsed:.1f} s ({len(results) / elapsed:.1f} req/s)')
+    print(f'{"endpoint":<16}{"count":>8}{"non-200":>9}{"p50":>9}{"p90":>9}{"p95":>9}{"p99":>9}{"max":>9}')
+    for endpoint, endpoint_results in sorted(by_endpoint.items()):
+        latencies = [result['latency_ms'] for result in endpoint_results]
+        failures = sum(1 for result in endpoint_results if result['status'] != 200)
+        print(f'{endpoint:<16}{len(endpoint_results):>8}{failures:>9}'
+              + ''.join(f'{percentile(latencies, value):>9.1f}' for value in (0.5, 0.9, 0.95, 0.99, 1.0)))
+
+    statuses = defaultdict(int)
+    for result in results:
+        statuses[result['status']] += 1
+    print('status codes:', dict(statuses))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--capture', default='./captures/traffic.jsonl*', help='Glob of capture files.')
+    parser.add_argument('--host', default='http://localhost:8080')
+    parser.add_argument('--speed', type=float, default=1.0, help='2 replays twice as fast as captured.')
+    parser.add_argument('--workers', type=int, default=64, help='Maximum requests in flight.')
+    parser.add_argument('--limit', type=int, default=None, help='Replay only the first N requests.')
+    args = parser.parse_args()
+
+    records = load_capture(args.capture, args.limit)
+    if not records:
+        raise SystemExit(f'No captured requests match {args.capture}')
+
+    start = time.monotonic()
+    results = replay(records, host=args.host, speed=args.speed, workers=args.workers)
+    report(results, elapsed=time.monotonic() - start)
+
+
+if __name__ == '__main__':
+    main()